@@ -3,10 +3,12 @@
 A very simple web server to act as a knowledge bank for sustainability resources.
 
 This server uses only Python's built‑in libraries to avoid external
-dependencies. It provides a minimal REST API for fetching and uploading
+dependencies; if ``orjson`` happens to be installed it is used for faster
+JSON encoding and decoding. It provides a minimal REST API for fetching and uploading
 resources as well as serving static pages and uploaded files. Resources are
-stored in a JSON file on disk (``data.json``) and uploaded files are saved
-to the ``uploads`` directory.
+stored in a JSON file on disk (``data.json``), with new uploads appended to
+a JSON Lines log (``data.jsonl``) that is periodically folded back into it,
+and uploaded files are saved to the ``uploads`` directory.
 
 Endpoints:
 
@@ -21,45 +23,592 @@ Endpoints:
 * ``/uploads/...`` – Serves uploaded files.
 
 The server listens on the port defined by the ``PORT`` environment
-variable, defaulting to 8000. It intentionally avoids any external network
-calls so that it can run in restricted environments.
+variable, defaulting to 8000. Requests are only logged when ``DEBUG`` is
+set to a true value such as ``1``; errors are always logged. It
+intentionally avoids any external network calls so that it can run in
+restricted environments.
 """
 
 from __future__ import annotations
 
+import bisect
+import contextlib
+import functools
+import hashlib
 import json
+import logging
+import logging.handlers
+import mimetypes
 import os
+import queue
+import re
+import secrets
+import time
 import urllib.parse
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from io import BytesIO
-import cgi
-import shutil
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Callable
+import threading
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_FILE = os.path.join(BASE_DIR, 'data.json')
 UPLOAD_DIR = os.path.join(BASE_DIR, 'uploads')
 
+# Request and error logs. Requests are only logged when the ``DEBUG``
+# environment variable is set to a true value such as ``1``; ``run_server``
+# hands the records to a background thread so that writing to stderr never
+# blocks a request.
+logger = logging.getLogger('knowledgebank')
 
-def load_data() -> list[dict]:
-    """Load the resources from the JSON file. Returns an empty list if the
-    file does not exist or cannot be parsed."""
-    if not os.path.exists(DATA_FILE):
-        return []
+# Size of the reads from the request body while parsing uploads and of the
+# write buffer used for uploaded files.
+UPLOAD_CHUNK_SIZE = 1 << 16
+UPLOAD_WRITE_BUFFER = 1 << 20
+
+# Resources appended since the last compaction, one JSON object per line.
+# Uploads only append to this log; it is folded back into ``DATA_FILE`` once
+# it holds ``COMPACT_THRESHOLD`` records and when the server starts. Like
+# ``DATA_FILE`` it is data to be committed: until it is compacted it holds
+# the only copy of recent uploads. The ``.tmp`` and ``.compacting`` files
+# next to them are transient and ignored by git.
+DATA_LOG_FILE = os.path.join(BASE_DIR, 'data.jsonl')
+COMPACT_THRESHOLD = 100
+# The log is moved here while it is being folded into ``DATA_FILE``, so that
+# its records are never in both files at once.
+COMPACTING_LOG_FILE = DATA_LOG_FILE + '.compacting'
+
+# Parsed contents of ``DATA_FILE`` and ``DATA_LOG_FILE``, keyed by the
+# modification time and size of both files so that repeated reads skip the
+# JSON decode while they are unchanged. ``log_count`` is the number of records
+# in the log. The ``index`` entry holds the lowercased searchable fields of
+# every resource so that filtering does not have to lowercase them again on
+# each request, and ``by_type``/``by_tag`` map lowercased types and tags to
+# positions in it. ``blob`` joins all lowercased titles and descriptions into
+# one string so a search term can be located with a single ``str.find`` scan;
+# ``offsets`` holds the start of each resource's record within it, and
+# ``mask`` combines the character masks of all resources.
+_CACHE: dict = {'stamp': None, 'data': [], 'log_count': 0, 'index': [], 'by_type': {},
+                'by_tag': {}, 'blob': '', 'offsets': [], 'mask': 0}
+_CACHE_LOCK = threading.RLock()
+
+# Frontend pages by URL path. Together with the files under ``static/`` they
+# are served from memory out of ``_ASSETS``, which maps a URL path to the
+# file's modification time, content type, body and ETag. The directories are
+# rescanned at most once every ``ASSET_CHECK_INTERVAL`` seconds and only
+# changed files are read again, so edits show up without a restart.
+PAGES = {
+    '/': 'templates/index.html',
+    '/upload': 'templates/upload.html',
+    '/resources': 'templates/resources.html',
+}
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+ASSET_CHECK_INTERVAL = 2.0
+
+# Separators used in the search blob. Terms containing them fall back to a
+# per-resource scan so matches can never span two fields or two records.
+_RECORD_SEP = '\x00'
+_FIELD_SEP = '\x01'
+
+# Scan the whole search blob for a term unless the type and tag filters leave
+# fewer than one in ``BLOB_SEARCH_RATIO`` resources as candidates.
+BLOB_SEARCH_RATIO = 8
+
+
+# Shared encoder for compact JSON when orjson is not available, so that
+# encoding does not set up a new ``JSONEncoder`` on every call.
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON, either compact or indented by two
+    spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return _JSON_ENCODER.encode(obj).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """Decode UTF-8 JSON. Raises ``ValueError`` if it cannot be parsed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _char_mask(text: str) -> int:
+    """Return a 64-bit mask with a bit set for every character in ``text``,
+    folding code points onto their lowest six bits."""
+    mask = 0
+    for c in set(text):
+        mask |= 1 << (ord(c) & 63)
+    return mask
+
+
+def _index_entry(r: dict) -> dict:
+    """Precompute the lowercased fields of a resource used by the
+    ``/api/resources`` filters. ``mask`` is the character mask of the title
+    and description: a term whose mask has a bit outside it cannot occur in
+    either, so the substring test can be skipped."""
+    title_lc = (r.get('title') or '').lower()
+    desc_lc = (r.get('description') or '').lower()
+    return {
+        'r': r,
+        'title_lc': title_lc,
+        'desc_lc': desc_lc,
+        'type_lc': (r.get('type') or '').lower(),
+        'tags_lc': frozenset(t.lower() for t in r.get('tags') or []),
+        'mask': _char_mask(title_lc + desc_lc),
+    }
+
+
+def _add_to_index(r: dict, pos: int) -> str:
+    """Add a resource to the end of the search index, with its record
+    starting at ``pos`` in the search blob. Returns that record, which the
+    caller appends to the blob."""
+    e = _index_entry(r)
+    index = _CACHE['index']
+    i = len(index)
+    index.append(e)
+    _CACHE['by_type'].setdefault(e['type_lc'], set()).add(i)
+    for t in e['tags_lc']:
+        _CACHE['by_tag'].setdefault(t, set()).add(i)
+    _CACHE['offsets'].append(pos)
+    _CACHE['mask'] |= e['mask']
+    return e['title_lc'] + _FIELD_SEP + e['desc_lc'] + _RECORD_SEP
+
+
+def _set_cache(stamp: tuple | None, resources: list[dict]) -> None:
+    """Replace the cached resources and rebuild their search index."""
+    _CACHE['stamp'] = stamp
+    _render_resources.cache_clear()
+    _CACHE['data'] = resources
+    _CACHE.update(index=[], by_type={}, by_tag={}, offsets=[], mask=0)
+    records = []
+    pos = 0
+    for r in resources:
+        records.append(_add_to_index(r, pos))
+        pos += len(records[-1])
+    _CACHE['blob'] = ''.join(records)
+
+
+def _find_in_blob(term: str, blob: str, offsets: list[int], count: int) -> list[int]:
+    """Return the positions of the resources whose title or description
+    contains ``term``, using one C-level scan over the search blob. Only the
+    first ``count`` offsets, the records making up ``blob``, are used."""
+    found = []
+    pos = blob.find(term)
+    while pos != -1:
+        i = bisect.bisect_right(offsets, pos, 0, count) - 1
+        found.append(i)
+        if i + 1 == count:
+            break
+        # Continue at the next record; one hit per resource is enough.
+        pos = blob.find(term, offsets[i + 1])
+    return found
+
+
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    """Return the modification time and size of ``path``, or ``None`` if it
+    does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _data_stamp() -> tuple:
+    return _file_stamp(DATA_FILE), _file_stamp(DATA_LOG_FILE)
+
+
+def _read_log() -> list[dict]:
+    """Read the records appended to ``DATA_LOG_FILE``. Lines that cannot be
+    parsed, such as a partially written last line, are skipped."""
+    records = []
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-        return []
-    except Exception:
-        return []
+        with open(DATA_LOG_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    records.append(record)
+    except OSError:
+        pass
+    return records
+
+
+def _recover_compaction() -> None:
+    """Finish a compaction that was interrupted by a crash.
+
+    If ``DATA_FILE`` is newer than the moved-aside log, the new snapshot was
+    written and already holds its records, so it is discarded. Otherwise the
+    snapshot was not replaced and the records are put back into the log.
+    """
+    side_stamp = _file_stamp(COMPACTING_LOG_FILE)
+    if side_stamp is None:
+        return
+    data_stamp = _file_stamp(DATA_FILE)
+    if data_stamp is not None and data_stamp[0] > side_stamp[0]:
+        os.remove(COMPACTING_LOG_FILE)
+    elif not os.path.exists(DATA_LOG_FILE):
+        os.replace(COMPACTING_LOG_FILE, DATA_LOG_FILE)
+    else:
+        with open(COMPACTING_LOG_FILE, 'rb') as f:
+            records = f.read()
+        with open(DATA_LOG_FILE, 'rb') as f:
+            newer = f.read()
+        if records and not records.endswith(b'\n'):
+            records += b'\n'
+        tmp_file = DATA_LOG_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(records + newer)
+        os.replace(tmp_file, DATA_LOG_FILE)
+        os.remove(COMPACTING_LOG_FILE)
+
+
+def load_data() -> list[dict]:
+    """Load the resources from the JSON file followed by those appended to
+    the log. Returns an empty list if neither file exists or can be parsed.
+
+    The parsed list is cached in memory and only re-read when either file
+    changes. Callers must treat the result as read-only.
+    """
+    with _CACHE_LOCK:
+        stamp = _data_stamp()
+        if stamp == _CACHE['stamp']:
+            return _CACHE['data']
+        _recover_compaction()
+        stamp = _data_stamp()
+        data = []
+        if stamp[0] is not None:
+            try:
+                with open(DATA_FILE, 'rb') as f:
+                    data = _loads(f.read())
+                if not isinstance(data, list):
+                    data = []
+            except Exception:
+                data = []
+        log = _read_log() if stamp[1] is not None else []
+        data = data + log
+        _CACHE['log_count'] = len(log)
+        _set_cache(stamp, data)
+        return data
 
 
 def save_data(resources: list[dict]) -> None:
-    """Write the given list of resources to the JSON file."""
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(resources, f, ensure_ascii=False, indent=2)
+    """Write the given list of resources to the JSON file and clear the log.
+
+    The data is written to a temporary file first and then moved into place,
+    so concurrent readers never see a partially written file. The log is
+    moved aside beforehand and only deleted once the new file is in place;
+    ``_recover_compaction`` sorts out a crash in between.
+    """
+    with _CACHE_LOCK:
+        _recover_compaction()
+        if os.path.exists(DATA_LOG_FILE):
+            os.replace(DATA_LOG_FILE, COMPACTING_LOG_FILE)
+        tmp_file = DATA_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(resources, indent=True) + b'\n')
+        os.replace(tmp_file, DATA_FILE)
+        if os.path.exists(COMPACTING_LOG_FILE):
+            os.remove(COMPACTING_LOG_FILE)
+        _CACHE['log_count'] = 0
+        _set_cache(_data_stamp(), resources)
+
+
+def append_resource(resource: dict) -> None:
+    """Add a resource by appending it as a single line to the log and to the
+    cached index, without rewriting or re-indexing the existing resources."""
+    with _CACHE_LOCK:
+        resources = load_data()
+        with open(DATA_LOG_FILE, 'a+b') as f:
+            # Terminate a partially written last line left by a crash, so the
+            # new record does not end up on the same, unparsable line.
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(_dumps(resource) + b'\n')
+        # Extend the cached list and index in place instead of rebuilding
+        # them for every resource.
+        resources.append(resource)
+        _CACHE['blob'] += _add_to_index(resource, len(_CACHE['blob']))
+        _CACHE['log_count'] += 1
+        _CACHE['stamp'] = _data_stamp()
+        _render_resources.cache_clear()
+        if _CACHE['log_count'] >= COMPACT_THRESHOLD:
+            compact_data()
+
+
+def compact_data() -> None:
+    """Fold the records in the log back into ``DATA_FILE``."""
+    with _CACHE_LOCK:
+        resources = load_data()
+        if _CACHE['log_count']:
+            save_data(resources)
+
+
+def search_resources(term: str = '', rtype: str = '', tag: str = '') -> list[dict]:
+    """Return the resources matching the given lowercased search term, type
+    and tag, in their original order. Empty arguments are not filtered on.
+
+    The type and tag filters are dictionary lookups in the inverted index,
+    combined by set intersection. The term is located with a single scan of
+    the search blob unless those filters leave only a small fraction of the
+    resources, in which case just the candidates are tested.
+    """
+    term_mask = _char_mask(term)
+    with _CACHE_LOCK:
+        load_data()
+        # Uploads extend the index and the type and tag sets in place, so
+        # the candidates are selected, and copied, while holding the lock.
+        # Positions below ``count`` are never changed afterwards.
+        index = _CACHE['index']
+        count = len(index)
+        blob = _CACHE['blob']
+        offsets = _CACHE['offsets']
+        if term and term_mask & ~_CACHE['mask']:
+            # Some character of the term occurs in no resource at all.
+            return []
+        candidates = None
+        if rtype:
+            candidates = set(_CACHE['by_type'].get(rtype, ()))
+        if tag:
+            tagged = _CACHE['by_tag'].get(tag, set())
+            candidates = set(tagged) if candidates is None else candidates & tagged
+    if (term and _RECORD_SEP not in term and _FIELD_SEP not in term
+            and (candidates is None or len(candidates) * BLOB_SEARCH_RATIO > count)):
+        found = _find_in_blob(term, blob, offsets, count)
+        return [index[i]['r'] for i in found if candidates is None or i in candidates]
+    entries = index[:count] if candidates is None else [index[i] for i in sorted(candidates)]
+    if term:
+        entries = [e for e in entries
+                   if not term_mask & ~e['mask'] and (term in e['title_lc'] or term in e['desc_lc'])]
+    return [e['r'] for e in entries]
+
+
+def render_resources(term: str = '', rtype: str = '', tag: str = '') -> bytes:
+    """Return the JSON-encoded result of ``search_resources``.
+
+    Encoded responses are kept in an LRU cache keyed by the filters and the
+    state of the data files, so repeated queries skip both the filtering and
+    the serialization.
+    """
+    with _CACHE_LOCK:
+        load_data()
+        stamp = _CACHE['stamp']
+    return _render_resources(stamp, term, rtype, tag)
+
+
+@functools.lru_cache(maxsize=256)
+def _render_resources(stamp: tuple, term: str, rtype: str, tag: str) -> bytes:
+    return _dumps(search_resources(term, rtype, tag))
+
+
+# A ``; key=value`` or ``; key="quoted value"`` parameter of a header.
+_HEADER_PARAM_RE = re.compile(r';\s*([^\s=;]+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;]*))')
+_QUOTED_PAIR_RE = re.compile(r'\\(.)')
+
+
+def _read_asset(path: str, mtime: int, content_type: str) -> tuple[int, str, bytes, str]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    return mtime, content_type, data, '"%s"' % hashlib.md5(data, usedforsecurity=False).hexdigest()
+
+
+def _scan_assets():
+    """Yield the URL path, file path, modification time and content type of
+    every page and static asset, listing each directory with ``os.scandir``."""
+    pages_by_dir: dict[str, dict[str, str]] = {}
+    for url_path, relative_path in PAGES.items():
+        full_path = os.path.join(BASE_DIR, relative_path)
+        pages_by_dir.setdefault(os.path.dirname(full_path), {})[os.path.basename(full_path)] = url_path
+    for directory, names in pages_by_dir.items():
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name in names and entry.is_file():
+                    yield names[entry.name], entry.path, entry.stat().st_mtime_ns, 'text/html'
+    pending = [(STATIC_DIR, '/static/')]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending.append((entry.path, prefix + entry.name + '/'))
+                elif entry.is_file():
+                    content_type = mimetypes.guess_type(entry.name)[0] or 'application/octet-stream'
+                    yield prefix + entry.name, entry.path, entry.stat().st_mtime_ns, content_type
+
+
+_ASSETS: dict[str, tuple[int, str, bytes, str]] = {}
+_ASSETS_LOCK = threading.Lock()
+_assets_checked: float | None = None
+
+
+def refresh_assets(force: bool = False) -> None:
+    """Bring ``_ASSETS`` up to date with the files on disk, re-reading only
+    those whose modification time changed. Does nothing if the last check was
+    less than ``ASSET_CHECK_INTERVAL`` seconds ago, unless ``force`` is set.
+
+    The lock is only taken to claim a check and to swap in its results; the
+    directories are scanned and the files read without holding it, so other
+    requests keep being served from ``_ASSETS`` meanwhile.
+    """
+    global _assets_checked
+
+    def due(now: float) -> bool:
+        return force or _assets_checked is None or now - _assets_checked >= ASSET_CHECK_INTERVAL
+
+    if not due(time.monotonic()):
+        return
+    with _ASSETS_LOCK:
+        now = time.monotonic()
+        if not due(now):
+            return
+        _assets_checked = now
+    seen = set()
+    updates = {}
+    for url_path, path, mtime, content_type in _scan_assets():
+        seen.add(url_path)
+        cached = _ASSETS.get(url_path)
+        if cached is None or cached[0] != mtime:
+            try:
+                updates[url_path] = _read_asset(path, mtime, content_type)
+            except OSError:
+                seen.discard(url_path)
+    with _ASSETS_LOCK:
+        _ASSETS.update(updates)
+        for url_path in list(_ASSETS):
+            if url_path not in seen:
+                del _ASSETS[url_path]
+
+
+refresh_assets(force=True)
+
+
+def _parse_header_params(value: str) -> tuple[str, dict[str, str]]:
+    """Split a header such as ``Content-Disposition`` into its main value and
+    a dict of its (unquoted) parameters."""
+    main, sep, rest = value.partition(';')
+    result = {}
+    for m in _HEADER_PARAM_RE.finditer(sep + rest):
+        key, quoted, token = m.groups()
+        val = _QUOTED_PAIR_RE.sub(r'\1', quoted) if quoted is not None else token.strip()
+        result[key.lower()] = val
+    return main.strip().lower(), result
+
+
+def parse_multipart(rfile: BinaryIO, boundary: bytes, length: int,
+                    open_file: Callable[[str], BinaryIO]) -> tuple[dict[str, str], str | None]:
+    """Parse a ``multipart/form-data`` body of ``length`` bytes from ``rfile``.
+
+    Text fields are collected and returned as a dict. The contents of the
+    first part that carries a filename are streamed in chunks straight into
+    the file object returned by ``open_file(filename)``, so the upload is
+    never held in memory or spooled to a temporary file. Returns the fields
+    and the submitted filename (or ``None``). Raises ``ValueError`` if the
+    body is malformed.
+
+    The body is read into a single reusable ``bytearray``; boundaries are
+    located with ``bytearray.find`` and part contents are handed on as
+    ``memoryview`` slices, so the data is not copied again on its way to
+    disk.
+    """
+    delimiter = b'\r\n--' + boundary
+    remaining = length
+    # Prefix a CRLF so that the first boundary matches ``delimiter`` as well.
+    buf = bytearray(b'\r\n')
+    chunk = bytearray(UPLOAD_CHUNK_SIZE)
+    chunk_view = memoryview(chunk)
+
+    def fill() -> bool:
+        nonlocal remaining
+        if remaining <= 0:
+            return False
+        n = rfile.readinto(chunk_view[:min(UPLOAD_CHUNK_SIZE, remaining)])
+        if not n:
+            remaining = 0
+            return False
+        remaining -= n
+        buf.extend(chunk_view[:n])
+        return True
+
+    def consume(n: int, sink: Callable[[memoryview], object] | None) -> None:
+        # Pass the first ``n`` bytes to ``sink`` without copying them, then
+        # drop them from the buffer. The view is released before the buffer
+        # is resized, so sinks must not keep a reference to it.
+        if sink and n:
+            with memoryview(buf) as view, view[:n] as part:
+                sink(part)
+        del buf[:n]
+
+    def read_until(marker: bytes, sink: Callable[[memoryview], object] | None) -> None:
+        # Pass everything before ``marker`` to ``sink`` and drop it, together
+        # with the marker itself, from the buffer.
+        while True:
+            idx = buf.find(marker)
+            if idx != -1:
+                consume(idx, sink)
+                del buf[:len(marker)]
+                return
+            # Keep a tail that may hold the start of a split marker.
+            keep = len(marker) - 1
+            if len(buf) > keep:
+                consume(len(buf) - keep, sink)
+            if not fill():
+                raise ValueError('unexpected end of multipart body')
+
+    fields: dict[str, str] = {}
+    filename = None
+    read_until(delimiter, None)
+    while True:
+        while len(buf) < 2:
+            if not fill():
+                raise ValueError('unexpected end of multipart body')
+        if buf.startswith(b'--'):
+            break
+        raw_headers = bytearray()
+        read_until(b'\r\n\r\n', raw_headers.extend)
+        headers = {}
+        for line in raw_headers.decode('utf-8', 'replace').split('\r\n'):
+            key, _, val = line.partition(':')
+            if key:
+                headers[key.strip().lower()] = val.strip()
+        _, params = _parse_header_params(headers.get('content-disposition', ''))
+        name = params.get('name', '')
+        if params.get('filename') and filename is None:
+            filename = params['filename']
+            f = open_file(filename)
+            with f:
+                read_until(delimiter, f.write)
+        elif 'filename' in params:
+            read_until(delimiter, None)
+        else:
+            # Only text fields are decoded; they are small.
+            value = bytearray()
+            read_until(delimiter, value.extend)
+            fields.setdefault(name, value.decode('utf-8', 'replace'))
+    # Drain anything after the closing boundary (typically a trailing CRLF).
+    while fill():
+        buf.clear()
+    return fields, filename
 
 
 class KnowledgeBankHandler(SimpleHTTPRequestHandler):
@@ -71,6 +620,36 @@ class KnowledgeBankHandler(SimpleHTTPRequestHandler):
     and ``do_POST`` to implement additional API endpoints.
     """
 
+    # Status line and fixed headers of a JSON response, encoded once. Only the
+    # Date and Content-Length headers are added per response.
+    _JSON_RESPONSE_HEAD = (
+        f'{SimpleHTTPRequestHandler.protocol_version} 200 OK\r\n'
+        f'Server: {SimpleHTTPRequestHandler.server_version} {SimpleHTTPRequestHandler.sys_version}\r\n'
+        'Content-Type: application/json\r\n'
+        'Access-Control-Allow-Origin: *\r\n'
+    ).encode('latin-1')
+
+    # Escapes control characters in logged request data.
+    _LOG_ESCAPES = str.maketrans({c: f'\\x{c:02x}' for c in [*range(0x20), *range(0x7f, 0xa0)]})
+
+    def log_request(self, code='-', size='-') -> None:
+        if logger.isEnabledFor(logging.INFO):
+            super().log_request(code, size)
+
+    def log_error(self, format, *args) -> None:
+        if logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, format, args)
+
+    def log_message(self, format, *args) -> None:
+        """Send log messages to the ``knowledgebank`` logger instead of
+        writing them to stderr directly."""
+        if logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, format, args)
+
+    def _log(self, level: int, format: str, args: tuple) -> None:
+        message = (format % args).translate(self._LOG_ESCAPES)
+        logger.log(level, '%s - %s', self.address_string(), message)
+
     def end_headers(self) -> None:
         """Set common headers for all responses."""
         # Allow CORS for frontend fetch calls running on the same origin.
@@ -84,31 +663,20 @@ class KnowledgeBankHandler(SimpleHTTPRequestHandler):
 
         # Serve API endpoint for listing resources
         if path == '/api/resources':
-            resources = load_data()
-            # Filter by search query
-            if 'q' in query and query['q']:
-                term = query['q'][0].lower()
-                resources = [r for r in resources if term in r.get('title', '').lower() or term in r.get('description', '').lower()]
-            # Filter by type
-            if 'type' in query and query['type'] and query['type'][0]:
-                rtype = query['type'][0].lower()
-                resources = [r for r in resources if r.get('type', '').lower() == rtype]
-            # Filter by tag
-            if 'tag' in query and query['tag'] and query['tag'][0]:
-                tag = query['tag'][0].lower()
-                resources = [r for r in resources if tag in [t.lower() for t in r.get('tags', [])]]
-            self.respond_json(resources)
+            term = query['q'][0].lower() if query.get('q') else ''
+            rtype = query['type'][0].lower() if query.get('type') else ''
+            tag = query['tag'][0].lower() if query.get('tag') else ''
+            self.respond_json_bytes(render_resources(term, rtype, tag))
             return
 
-        # Serve frontend pages
-        if path == '/':
-            return self.serve_asset('templates/index.html', 'text/html')
-        if path == '/upload':
-            return self.serve_asset('templates/upload.html', 'text/html')
-        if path == '/resources':
-            return self.serve_asset('templates/resources.html', 'text/html')
+        # Serve frontend pages and static assets from memory
+        if path in PAGES or path.startswith('/static/'):
+            refresh_assets()
+            asset = _ASSETS.get(path)
+            if asset is not None:
+                return self.serve_asset(asset)
 
-        # Serve static files from the project directory
+        # Serve other static files from the project directory
         if path.startswith('/static/') or path.startswith('/uploads/'):
             # Use the base class static file handler
             return super().do_GET()
@@ -121,93 +689,161 @@ class KnowledgeBankHandler(SimpleHTTPRequestHandler):
         if parsed.path == '/api/upload':
             # Ensure upload directory exists
             os.makedirs(UPLOAD_DIR, exist_ok=True)
-            # Use FieldStorage for easier multipart parsing
-            form = cgi.FieldStorage(fp=self.rfile,
-                                    headers=self.headers,
-                                    environ={'REQUEST_METHOD': 'POST',
-                                             'CONTENT_TYPE': self.headers['Content-Type']})
-            title = form.getfirst('title', '').strip()
-            description = form.getfirst('description', '').strip()
-            rtype = form.getfirst('type', '').strip()
-            tags_raw = form.getfirst('tags', '').strip()
-            url_field = form.getfirst('url', '').strip()
+            ctype, params = _parse_header_params(self.headers.get('Content-Type', ''))
+            boundary = params.get('boundary', '')
+            if ctype != 'multipart/form-data' or not boundary:
+                self.send_error(400, 'Bad Request')
+                return
+            try:
+                length = int(self.headers.get('Content-Length', ''))
+            except ValueError:
+                self.send_error(411, 'Length Required')
+                return
+            # Stream the multipart body; the file part is written straight to
+            # its destination in ``UPLOAD_DIR``.
+            stored = []
+            try:
+                form, original_name = parse_multipart(self.rfile, boundary.encode('latin-1'),
+                                                      length, lambda name: self.open_upload(name, stored))
+            except BaseException as exc:
+                # Remove partially written files, whether the body was
+                # malformed, the client went away or the disk filled up.
+                for dest_name in stored:
+                    with contextlib.suppress(OSError):
+                        os.remove(os.path.join(UPLOAD_DIR, dest_name))
+                if not isinstance(exc, ValueError):
+                    raise
+                self.send_error(400, 'Bad Request')
+                return
+            title = form.get('title', '').strip()
+            description = form.get('description', '').strip()
+            rtype = form.get('type', '').strip()
+            tags_raw = form.get('tags', '').strip()
+            url_field = form.get('url', '').strip()
             tags = [t.strip() for t in tags_raw.split(',') if t.strip()]
-            filename = None
-            # Handle file upload
-            file_item = form['file'] if 'file' in form else None
-            if file_item and file_item.filename:
-                # Sanitize filename
-                original_name = os.path.basename(file_item.filename)
-                # Ensure unique filename by prefixing with a number if needed
-                base_name, ext = os.path.splitext(original_name)
-                dest_name = original_name
-                counter = 1
-                dest_path = os.path.join(UPLOAD_DIR, dest_name)
-                while os.path.exists(dest_path):
-                    dest_name = f"{base_name}_{counter}{ext}"
-                    dest_path = os.path.join(UPLOAD_DIR, dest_name)
-                    counter += 1
-                with open(dest_path, 'wb') as f:
-                    shutil.copyfileobj(file_item.file, f)
-                filename = dest_name
+            filename = stored[0] if stored else None
 
             # Construct resource entry
             resource = {
-                'title': title or (file_item.filename if (file_item and file_item.filename) else ''),
+                'title': title or (original_name or ''),
                 'description': description,
                 'type': rtype,
                 'tags': tags,
                 'url': url_field,
                 'file': filename,
             }
-            resources = load_data()
-            resources.append(resource)
-            save_data(resources)
+            append_resource(resource)
             # Respond with created resource
             self.send_response(201)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps(resource).encode('utf-8'))
+            self.wfile.write(_dumps(resource))
             return
 
         # Unknown POST endpoint
         self.send_error(404, 'Not Found')
 
     # Helper methods
-    def serve_asset(self, relative_path: str, content_type: str) -> None:
-        """Serve a file relative to the project root with the given content type."""
-        full_path = os.path.join(BASE_DIR, relative_path)
-        if not os.path.isfile(full_path):
-            self.send_error(404, 'Not Found')
-            return
-        try:
-            with open(full_path, 'rb') as f:
-                data = f.read()
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', str(len(data)))
-            self.end_headers()
-            self.wfile.write(data)
-        except Exception:
-            self.send_error(500, 'Internal Server Error')
+    def open_upload(self, filename: str, stored: list[str]) -> BinaryIO:
+        """Open a new file in ``UPLOAD_DIR`` for the uploaded ``filename`` and
+        record the name it is stored under in ``stored``."""
+        # Sanitize filename
+        original_name = os.path.basename(filename)
+        # Ensure unique filename by adding a random suffix if the name is
+        # taken, instead of probing numbered names one by one.
+        base_name, ext = os.path.splitext(original_name)
+        dest_name = original_name
+        while True:
+            # Exclusive creation, so concurrent uploads never share a file.
+            try:
+                f = open(os.path.join(UPLOAD_DIR, dest_name), 'xb', buffering=UPLOAD_WRITE_BUFFER)
+                break
+            except FileExistsError:
+                dest_name = f"{base_name}_{secrets.token_hex(4)}{ext}"
+        stored.append(dest_name)
+        return f
 
-    def respond_json(self, obj) -> None:
-        """Send a JSON response."""
-        data = json.dumps(obj).encode('utf-8')
+    def serve_asset(self, asset: tuple[int, str, bytes, str]) -> None:
+        """Serve a page or static asset from ``_ASSETS``, answering with 304
+        Not Modified if the client already has the current version."""
+        _, content_type, data, etag = asset
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag in (t.strip() for t in if_none_match.split(',')) or if_none_match.strip() == '*':
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
         self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Type', content_type)
         self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
         self.end_headers()
         self.wfile.write(data)
 
+    def copyfile(self, source, outputfile) -> None:
+        """Copy a file to the client with ``sendfile`` so the kernel moves the
+        data to the socket without passing it through Python."""
+        if outputfile is not self.wfile:
+            super().copyfile(source, outputfile)
+            return
+        # ``wfile`` is unbuffered, so the headers have already been sent.
+        self.connection.sendfile(source)
+
+    def respond_json_bytes(self, data: bytes) -> None:
+        """Send an already encoded JSON response.
+
+        The status line and headers are assembled from pre-encoded bytes and
+        sent together with the body in one ``sendmsg`` call, without copying
+        the (cached) body into a new buffer.
+        """
+        self.log_request(200)
+        head = b''.join((
+            self._JSON_RESPONSE_HEAD,
+            b'Date: %s\r\nContent-Length: %d\r\n\r\n' % (self.date_time_string().encode('latin-1'), len(data)),
+        ))
+        if not hasattr(self.connection, 'sendmsg'):
+            self.wfile.write(head)
+            self.wfile.write(data)
+            return
+        buffers = [memoryview(head), memoryview(data)]
+        while buffers:
+            sent = self.connection.sendmsg(buffers)
+            # Drop what was sent and retry with the rest after a partial send.
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers[0])
+                buffers.pop(0)
+            if buffers:
+                buffers[0] = buffers[0][sent:]
+
+
+class KnowledgeBankServer(ThreadingHTTPServer):
+    """HTTP server handling each request in its own thread, so a slow upload
+    does not block other clients."""
+
+    # Accept bursts of simultaneous connections instead of resetting them.
+    request_queue_size = 128
+
 
 def run_server() -> None:
     """Start the HTTP server."""
     port = int(os.environ.get('PORT', '8000'))
     os.makedirs(UPLOAD_DIR, exist_ok=True)
-    server = HTTPServer(('', port), KnowledgeBankHandler)
+    compact_data()
+    log_queue = queue.SimpleQueue()
+    stderr_handler = logging.StreamHandler()
+    stderr_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stderr_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    debug = os.environ.get('DEBUG', '').strip().lower() in ('1', 'true', 'yes', 'on')
+    logger.setLevel(logging.INFO if debug else logging.WARNING)
+    logger.propagate = False
+    listener.start()
+    server = KnowledgeBankServer(('', port), KnowledgeBankHandler)
     print(f"Server running on port {port}...")
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    finally:
+        listener.stop()
 
 
 if __name__ == '__main__':